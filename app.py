@@ -5,59 +5,72 @@ A Flask-based API service for generating and validating semantic router configur
 """
 
 from flask import Flask, request, jsonify, Response
+from flask.json.provider import JSONProvider
+from werkzeug.exceptions import RequestEntityTooLarge
+import orjson
 import yaml
 import logging
-from typing import Dict, List, Any, Optional
-import json
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import functools
+import gzip
+import hashlib
+import re
+import textwrap
+import threading
+
+from validation import ValidationResult, validate_config
+
+# Prefer the libyaml C bindings, falling back to the pure-Python implementation
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# Loader and dumper instances are bound to a single stream, so bind the
+# configured entry points once rather than per call site
+safe_load_yaml = functools.partial(yaml.load, Loader=SafeLoader)
+dump_yaml = functools.partial(yaml.dump, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
+if not yaml.__with_libyaml__:
+    logger.warning("PyYAML was built without libyaml; falling back to the slower pure-Python parser and emitter")
+
+# Response compression: only text payloads, and only when large enough to benefit
+GZIP_MIMETYPES = frozenset({'application/json', 'text/yaml'})
+GZIP_MIN_SIZE = 500
+
+# Largest request body accepted, in bytes; Werkzeug enforces it while reading
+MAX_REQUEST_SIZE = 1024 * 1024
+
+# Static results for documents that cannot hold a configuration
+EMPTY_CONFIG_RESULT = {'valid': False, 'errors': ['Configuration is empty']}
+NOT_A_MAPPING_RESULT: ValidationResult = {'valid': False, 'errors': ['Configuration must be a YAML mapping']}
+
+# Match jsonify's default output: sorted keys, trailing newline
+ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=ORJSON_OPTIONS), mimetype='application/json')
 
-# Supported plugin types
-SUPPORTED_PLUGINS = [
-    'semantic-cache',
-    'jailbreak',
-    'pii',
-    'system_prompt',
-    'header_mutation',
-    'hallucination',
-    'router_replay'
-]
-
-# Plugin configuration schemas
-PLUGIN_SCHEMAS = {
-    'semantic-cache': {
-        'required': ['enabled'],
-        'optional': ['similarity_threshold', 'ttl_seconds']
-    },
-    'jailbreak': {
-        'required': ['enabled'],
-        'optional': ['threshold']
-    },
-    'pii': {
-        'required': ['enabled'],
-        'optional': ['threshold', 'pii_types_allowed']
-    },
-    'system_prompt': {
-        'required': ['enabled'],
-        'optional': ['system_prompt', 'mode']
-    },
-    'header_mutation': {
-        'required': [],
-        'optional': ['add', 'update', 'delete']
-    },
-    'hallucination': {
-        'required': ['enabled'],
-        'optional': ['use_nli', 'hallucination_action']
-    },
-    'router_replay': {
-        'required': ['enabled'],
-        'optional': ['max_records', 'capture_request_body', 'capture_response_body', 'max_body_bytes']
-    }
-}
+
+app = Flask(__name__)
+app.json = OrjsonProvider(app)
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_SIZE
 
 # Configuration templates
 CONFIGURATION_TEMPLATES = {
@@ -159,101 +172,130 @@ CONFIGURATION_TEMPLATES = {
 }
 
 
-def validate_plugin(plugin: Dict[str, Any]) -> List[str]:
-    """Validate a single plugin configuration."""
-    errors = []
-    
-    if 'type' not in plugin:
-        errors.append("Plugin missing 'type' field")
-        return errors
-    
-    plugin_type = plugin['type']
-    if plugin_type not in SUPPORTED_PLUGINS:
-        errors.append(f"Unsupported plugin type: {plugin_type}")
-        return errors
-    
-    if 'configuration' not in plugin:
-        errors.append(f"Plugin '{plugin_type}' missing 'configuration' field")
-        return errors
-    
-    config = plugin['configuration']
-    schema = PLUGIN_SCHEMAS.get(plugin_type, {})
-    
-    # Check required fields
-    for field in schema.get('required', []):
-        if field not in config:
-            errors.append(f"Plugin '{plugin_type}' missing required field: {field}")
-    
-    # Validate field types and values
-    if 'enabled' in config and not isinstance(config['enabled'], bool):
-        errors.append(f"Plugin '{plugin_type}': 'enabled' must be a boolean")
-    
-    if 'threshold' in config or 'similarity_threshold' in config:
-        threshold = config.get('threshold') or config.get('similarity_threshold')
-        if not isinstance(threshold, (int, float)) or threshold < 0 or threshold > 1:
-            errors.append(f"Plugin '{plugin_type}': threshold must be between 0.0 and 1.0")
-    
-    if 'ttl_seconds' in config:
-        if not isinstance(config['ttl_seconds'], int) or config['ttl_seconds'] < 0:
-            errors.append(f"Plugin '{plugin_type}': ttl_seconds must be a non-negative integer")
-    
-    if 'max_records' in config:
-        if not isinstance(config['max_records'], int) or config['max_records'] <= 0:
-            errors.append(f"Plugin '{plugin_type}': max_records must be a positive integer")
+def validate_config_yaml(config_str: str, max_errors: Optional[int] = None) -> ValidationResult:
+    """Parse and validate a YAML configuration, raising yaml.YAMLError if it is malformed."""
+    config = safe_load_yaml(config_str)
+    if not isinstance(config, dict):
+        return NOT_A_MAPPING_RESULT
+    return validate_config(config, max_errors)
+
+
+# Results of recently validated documents, keyed on a digest of their text so
+# the cache never holds on to the documents themselves
+VALIDATION_CACHE_SIZE = 512
+_validation_cache: 'OrderedDict[Tuple[bytes, Optional[int]], ValidationResult]' = OrderedDict()
+_validation_cache_lock = threading.Lock()
+
+
+def cached_validate_config_yaml(config_str: str, max_errors: Optional[int] = None) -> ValidationResult:
+    """Validate a YAML configuration, memoized on a digest of its text.
+
+    The returned result is shared between callers and must not be mutated.
+    """
+    digest = hashlib.blake2b(config_str.encode('utf-8'), digest_size=16).digest()
+    key = (digest, max_errors)
+    with _validation_cache_lock:
+        result = _validation_cache.get(key)
+        if result is not None:
+            _validation_cache.move_to_end(key)
+            return result
     
-    if 'mode' in config and config['mode'] not in ['replace', 'insert']:
-        errors.append(f"Plugin '{plugin_type}': mode must be 'replace' or 'insert'")
+    result = validate_config_yaml(config_str, max_errors)
+    with _validation_cache_lock:
+        _validation_cache[key] = result
+        if len(_validation_cache) > VALIDATION_CACHE_SIZE:
+            _validation_cache.popitem(last=False)
+    return result
+
+
+# Strings that can be emitted as plain YAML scalars without quoting, provided
+# they do not resolve to another type (e.g. 'true', '1.0', '~')
+_PLAIN_SCALAR = re.compile(r'[A-Za-z0-9_./][A-Za-z0-9_./:@~+-]*(?<!:)\Z')
+_YAML_RESOLVER = yaml.resolver.Resolver()
+_YAML_STR_TAG = 'tag:yaml.org,2002:str'
+
+
+def format_yaml_scalar(value: Any) -> Optional[str]:
+    """Format a simple scalar as YAML, or return None if it needs the full emitter."""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return str(value)
+    if not isinstance(value, str):
+        return None
     
-    return errors
+    if _PLAIN_SCALAR.match(value) and \
+            _YAML_RESOLVER.resolve(yaml.ScalarNode, value, (True, False)) == _YAML_STR_TAG:
+        return value
+    if value.isascii() and value.isprintable():
+        return "'" + value.replace("'", "''") + "'"
+    return None
 
 
-def validate_config(config: Dict[str, Any]) -> Dict[str, Any]:
-    """Validate a semantic router configuration."""
-    errors = []
+def emit_config_yaml(config: Dict[str, Any]) -> Optional[str]:
+    """Emit a generated configuration as YAML without the general-purpose emitter.
+
+    Only the plugin lists go through yaml.dump. Returns None when the
+    configuration holds values the fast path cannot format, so callers can
+    fall back to yaml.dump for the whole document.
+    """
+    version = format_yaml_scalar(config['version'])
+    if version is None:
+        return None
+    lines = [f"version: {version}", "listeners:"]
     
-    # Check version
-    if 'version' not in config:
-        errors.append("Configuration missing 'version' field")
+    for listener in config['listeners']:
+        port = format_yaml_scalar(listener['port'])
+        endpoints = listener['endpoints']
+        if port is None or not isinstance(endpoints, list):
+            return None
+        lines.append(f"- port: {port}")
+        lines.append("  endpoints:")
+        
+        for endpoint in endpoints:
+            if not isinstance(endpoint, dict) or not endpoint:
+                return None
+            prefix = "  - "
+            for key, value in endpoint.items():
+                key_yaml = format_yaml_scalar(key)
+                value_yaml = format_yaml_scalar(value)
+                if key_yaml is None or value_yaml is None:
+                    return None
+                lines.append(f"{prefix}{key_yaml}: {value_yaml}")
+                prefix = "    "
     
-    # Check listeners
-    if 'listeners' not in config:
-        errors.append("Configuration missing 'listeners' field")
-    else:
-        for i, listener in enumerate(config['listeners']):
-            if 'port' not in listener:
-                errors.append(f"Listener {i} missing 'port' field")
-            elif not isinstance(listener['port'], int) or listener['port'] <= 0:
-                errors.append(f"Listener {i}: port must be a positive integer")
-            
-            if 'endpoints' in listener:
-                for j, endpoint in enumerate(listener['endpoints']):
-                    if 'name' not in endpoint:
-                        errors.append(f"Listener {i}, endpoint {j} missing 'name' field")
-                    if 'url' not in endpoint:
-                        errors.append(f"Listener {i}, endpoint {j} missing 'url' field")
+    lines.append("decisions:")
+    rendered_plugins = {}
     
-    # Check decisions
-    if 'decisions' in config:
-        for i, decision in enumerate(config['decisions']):
-            if 'name' not in decision:
-                errors.append(f"Decision {i} missing 'name' field")
-            if 'endpoint' not in decision:
-                errors.append(f"Decision {i} missing 'endpoint' field")
-            
-            # Validate plugins
-            if 'plugins' in decision:
-                for plugin in decision['plugins']:
-                    plugin_errors = validate_plugin(plugin)
-                    errors.extend([f"Decision {i}: {e}" for e in plugin_errors])
+    for decision in config['decisions']:
+        name = format_yaml_scalar(decision['name'])
+        endpoint = format_yaml_scalar(decision['endpoint'])
+        if name is None or endpoint is None:
+            return None
+        lines.append(f"- name: {name}")
+        lines.append(f"  endpoint: {endpoint}")
+        
+        if 'plugins' in decision:
+            plugins = decision['plugins']
+            if not isinstance(plugins, list):
+                return None
+            # Decisions usually share one plugins list, so dump it only once
+            if id(plugins) not in rendered_plugins:
+                plugins_yaml = dump_yaml(plugins)
+                rendered_plugins[id(plugins)] = textwrap.indent(plugins_yaml, '  ').rstrip('\n')
+            lines.append("  plugins:")
+            lines.append(rendered_plugins[id(plugins)])
     
-    return {
-        'valid': len(errors) == 0,
-        'errors': errors
-    }
+    return '\n'.join(lines) + '\n'
 
 
-def generate_config(params: Dict[str, Any]) -> str:
-    """Generate a semantic router configuration from parameters."""
+def build_config_dict(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a semantic router configuration dict from parameters.
+
+    Endpoints pass through with any extra fields the caller supplied.
+    """
     config = {
         'version': params.get('version', '1.0')
     }
@@ -294,7 +336,74 @@ def generate_config(params: Dict[str, Any]) -> str:
     
     config['decisions'] = decisions
     
-    return yaml.dump(config, default_flow_style=False, sort_keys=False)
+    return config
+
+
+def dump_config(config: Dict[str, Any]) -> str:
+    """Serialize a configuration built by build_config_dict to YAML."""
+    config_yaml = emit_config_yaml(config)
+    if config_yaml is None:
+        config_yaml = dump_yaml(config)
+    
+    return config_yaml
+
+
+def generate_config(params: Dict[str, Any]) -> str:
+    """Generate a semantic router configuration from parameters."""
+    return dump_config(build_config_dict(params))
+
+
+def parse_json_body() -> Any:
+    """Parse the request body as JSON, returning None for an empty body."""
+    body = request.get_data(cache=False)
+    if not body:
+        return None
+    return orjson.loads(body)
+
+
+# Templates are static, so render their responses once at import
+_RENDERED_TEMPLATES = {
+    name: generate_config(template['config']).encode('utf-8')
+    for name, template in CONFIGURATION_TEMPLATES.items()
+}
+_TEMPLATES_JSON = orjson.dumps(CONFIGURATION_TEMPLATES, option=ORJSON_OPTIONS)
+
+# Pre-compressed once, so serving it gzipped costs nothing per request; the
+# individual templates are below GZIP_MIN_SIZE and are left uncompressed
+_TEMPLATES_JSON_GZIP = gzip.compress(_TEMPLATES_JSON, compresslevel=9, mtime=0)
+
+
+def accepts_gzip() -> bool:
+    """Whether the current request accepts a gzip-encoded response."""
+    return request.accept_encodings['gzip'] > 0
+
+
+def static_response(body: bytes, gzipped: bytes, mimetype: str) -> Response:
+    """Serve a pre-rendered body, using its pre-compressed form when the client accepts gzip."""
+    if len(body) >= GZIP_MIN_SIZE and accepts_gzip():
+        response = Response(gzipped, mimetype=mimetype)
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
+    return Response(body, mimetype=mimetype)
+
+
+@app.after_request
+def compress_response(response: Response) -> Response:
+    """Gzip JSON and YAML responses for clients that accept it."""
+    if response.mimetype not in GZIP_MIMETYPES:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    if response.direct_passthrough or 'Content-Encoding' in response.headers or not accepts_gzip():
+        return response
+    
+    body = response.get_data()
+    if len(body) < GZIP_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(body, compresslevel=1))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
 
 
 @app.route('/health', methods=['GET'])
@@ -307,14 +416,17 @@ def health():
 def generate():
     """Generate a semantic router configuration."""
     try:
-        params = request.get_json()
+        try:
+            params = parse_json_body()
+        except orjson.JSONDecodeError as e:
+            return jsonify({'error': f'Invalid JSON: {str(e)}'}), 400
+        except RequestEntityTooLarge:
+            return jsonify({'error': f'Request body exceeds {MAX_REQUEST_SIZE} bytes'}), 413
+        
         if not params:
             return jsonify({'error': 'Request body is required'}), 400
         
-        config_yaml = generate_config(params)
-        
-        # Parse the generated YAML to validate it
-        config_dict = yaml.safe_load(config_yaml)
+        config_dict = build_config_dict(params)
         validation_result = validate_config(config_dict)
         
         if not validation_result['valid']:
@@ -323,7 +435,7 @@ def generate():
                 'validation_errors': validation_result['errors']
             }), 400
         
-        return Response(config_yaml, mimetype='text/yaml'), 200
+        return Response(dump_config(config_dict), mimetype='text/yaml'), 200
     
     except Exception as e:
         logger.error(f"Error generating configuration: {str(e)}")
@@ -334,23 +446,34 @@ def generate():
 def validate():
     """Validate a semantic router configuration."""
     try:
-        data = request.get_json()
-        if not data or 'config' not in data:
+        try:
+            data = parse_json_body()
+        except orjson.JSONDecodeError as e:
+            return jsonify({'error': f'Invalid JSON: {str(e)}'}), 400
+        except RequestEntityTooLarge:
+            return jsonify({'error': f'Request body exceeds {MAX_REQUEST_SIZE} bytes'}), 413
+        
+        if not isinstance(data, dict) or 'config' not in data:
             return jsonify({'error': 'Request must include "config" field'}), 400
         
         config_str = data['config']
         
-        # Parse YAML
+        # Reject input the parser cannot turn into a configuration before parsing it
+        if not isinstance(config_str, str):
+            return jsonify({'error': '"config" must be a YAML string'}), 400
+        if not config_str or config_str.isspace():
+            return jsonify(EMPTY_CONFIG_RESULT), 200
+        
+        # Parse and validate, stopping at the first error if requested
+        fail_fast = request.args.get('fail_fast', '').lower() in ('1', 'true')
         try:
-            config_dict = yaml.safe_load(config_str)
+            result = cached_validate_config_yaml(config_str, max_errors=1 if fail_fast else None)
         except yaml.YAMLError as e:
             return jsonify({
                 'valid': False,
                 'errors': [f'Invalid YAML: {str(e)}']
             }), 200
         
-        # Validate configuration
-        result = validate_config(config_dict)
         return jsonify(result), 200
     
     except Exception as e:
@@ -361,24 +484,16 @@ def validate():
 @app.route('/templates', methods=['GET'])
 def templates():
     """Get available configuration templates."""
-    return jsonify(CONFIGURATION_TEMPLATES), 200
+    return static_response(_TEMPLATES_JSON, _TEMPLATES_JSON_GZIP, 'application/json'), 200
 
 
 @app.route('/templates/<template_name>', methods=['GET'])
 def get_template(template_name: str):
     """Get a specific configuration template."""
-    try:
-        if template_name not in CONFIGURATION_TEMPLATES:
-            return jsonify({'error': f'Template "{template_name}" not found'}), 404
-        
-        template = CONFIGURATION_TEMPLATES[template_name]
-        config_yaml = generate_config(template['config'])
-        
-        return Response(config_yaml, mimetype='text/yaml'), 200
+    if template_name not in _RENDERED_TEMPLATES:
+        return jsonify({'error': f'Template "{template_name}" not found'}), 404
     
-    except Exception as e:
-        logger.error(f"Error getting template: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+    return Response(_RENDERED_TEMPLATES[template_name], mimetype='text/yaml'), 200
 
 
 if __name__ == '__main__':
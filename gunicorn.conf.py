@@ -0,0 +1,20 @@
+"""
+Gunicorn configuration for the Semantic Router Configurator Skill.
+
+Run with: gunicorn --config gunicorn.conf.py app:app
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8080')
+
+# One preforked worker per CPU, each serving requests from a small thread pool
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+keepalive = 5
+timeout = 120
+
+# Load the app (compiled schemas, rendered templates) once before forking
+preload_app = True
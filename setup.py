@@ -0,0 +1,18 @@
+"""
+Optional build of the validation module as a native extension with mypyc.
+
+    pip install mypy==2.4.0
+    python setup.py build_ext --inplace
+
+app.py imports the compiled module transparently; without it the pure-Python
+validation.py is used.
+"""
+
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    name='semantic-router-configurator-skill',
+    py_modules=['validation'],
+    ext_modules=mypycify(['--ignore-missing-imports', 'validation.py']),
+)
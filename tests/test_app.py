@@ -0,0 +1,152 @@
+import gzip
+import random
+
+import yaml
+
+import app
+
+
+def post_validate(config, query=''):
+    return app.app.test_client().post('/validate' + query, json={'config': config})
+
+
+def test_validation_cache_keys_on_text_and_limit():
+    config = 'listeners:\n  - {}\n'
+    full = post_validate(config).get_json()
+    assert full['errors'] == ["Configuration missing 'version' field", "Listener 0 missing 'port' field"]
+    assert post_validate(config).get_json() == full
+    assert post_validate(config, '?fail_fast=1').get_json() == {
+        'valid': False,
+        'errors': ["Configuration missing 'version' field"],
+        'truncated': True
+    }
+
+
+def test_validation_cache_is_bounded():
+    for i in range(app.VALIDATION_CACHE_SIZE + 10):
+        post_validate(f'version: {i}\nlisteners: []\n')
+    assert len(app._validation_cache) <= app.VALIDATION_CACHE_SIZE
+
+
+def test_templates_are_gzipped_for_clients_that_accept_it():
+    client = app.app.test_client()
+    response = client.get('/templates', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == client.get('/templates').data
+    response = client.get('/templates/basic', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == client.get('/templates/basic').data
+
+
+def endpoint_config(url):
+    return f'version: 1.0\nlisteners:\n  - port: 8888\n    endpoints:\n      - {{name: default, url: {url}}}\n'
+
+
+def test_validation_reports_yaml_the_full_loader_rejects():
+    result = post_validate(endpoint_config('=')).get_json()
+    assert result['valid'] is False
+    assert "could not determine a constructor for the tag 'tag:yaml.org,2002:value'" in result['errors'][0]
+    assert 'line 5, column' in result['errors'][0]
+    # PyYAML raises ValueError rather than YAMLError for a malformed integer
+    response = post_validate(endpoint_config('0x_'))
+    assert response.status_code == 500
+    assert 'valid' not in response.get_json()
+
+
+# Scalars the fast emitter must quote, or hand to yaml.dump, to round-trip
+TRICKY_SCALARS = [
+    'true', 'no', 'null', '~', '', '1.0', '0x1F', '1e3', '2024-01-01', "it's", 'a: b', '#x', '- x', '<<',
+    'http://localhost:8000/v1', 'é', 'tab\there', 'line\nbreak', 1.5, -0.0, None, True, 0, 12
+]
+
+
+def assert_round_trips(params, fast_path):
+    config = app.build_config_dict(params)
+    assert (app.emit_config_yaml(config) is not None) is fast_path
+    assert yaml.safe_load(app.dump_config(config)) == config
+
+
+def test_dump_config_quotes_reserved_scalars():
+    plugins = [{'type': 'semantic-cache', 'configuration': {'enabled': True, 'similarity_threshold': 0.92}}]
+    endpoints = [{'name': name, 'url': 'http://localhost:8000/v1'} for name in ('true', '1.0', "it's", '~', '')]
+    assert_round_trips({'version': '1.0', 'port': 8888, 'endpoints': endpoints, 'plugins': plugins}, True)
+
+
+def test_dump_config_falls_back_for_values_it_cannot_format():
+    endpoint = {'name': 'default', 'url': 'http://localhost:8000/v1'}
+    assert_round_trips({'version': 1.0, 'endpoints': [endpoint]}, False)
+    assert_round_trips({'port': 88.5, 'endpoints': [endpoint]}, False)
+    assert_round_trips({'endpoints': [{'name': 'é', 'url': 'http://localhost:8000/v1'}]}, False)
+    assert_round_trips({'endpoints': [{**endpoint, 'headers': {'x-api-key': 'secret'}}]}, False)
+
+
+def test_dump_config_emits_shared_plugins_under_every_decision():
+    plugins = [{'type': 'pii', 'configuration': {'enabled': True, 'threshold': 0.7, 'pii_types_allowed': []}}]
+    endpoints = [{'name': f'model-{i}', 'url': f'http://localhost:800{i}/v1'} for i in range(3)]
+    config = app.build_config_dict({'endpoints': endpoints, 'plugins': plugins})
+    loaded = yaml.safe_load(app.dump_config(config))
+    assert loaded == config
+    assert [decision['plugins'] for decision in loaded['decisions']] == [plugins] * 3
+
+
+def test_dump_config_round_trips_random_configs():
+    rng = random.Random(0)
+    for _ in range(500):
+        endpoints = [
+            {rng.choice(['name', 'url', rng.choice(TRICKY_SCALARS)]): rng.choice(TRICKY_SCALARS) for _ in range(3)}
+            for _ in range(rng.randint(1, 3))
+        ]
+        for endpoint in endpoints:
+            endpoint['name'] = rng.choice(TRICKY_SCALARS)
+        params = {
+            'version': rng.choice(TRICKY_SCALARS),
+            'port': rng.choice(TRICKY_SCALARS),
+            'endpoints': endpoints,
+            'plugins': [{'type': rng.choice(TRICKY_SCALARS), 'configuration': {'enabled': rng.choice(TRICKY_SCALARS)}}]
+        }
+        config = app.build_config_dict(params)
+        assert yaml.safe_load(app.dump_config(config)) == config
+
+
+def test_fail_fast_reports_only_the_first_error():
+    assert post_validate('version: 1.0\n', '?fail_fast=1').get_json() == {
+        'valid': False, 'errors': ["Configuration missing 'listeners' field"]
+    }
+    assert post_validate('listeners: [{}]\n', '?fail_fast=true').get_json() == {
+        'valid': False, 'errors': ["Configuration missing 'version' field"], 'truncated': True
+    }
+
+
+def test_validate_rejects_malformed_requests():
+    client = app.app.test_client()
+    response = client.post('/validate', data='{', content_type='application/json')
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith('Invalid JSON: ')
+    for body in ([], {}, {'configuration': 'version: 1.0'}):
+        response = client.post('/validate', json=body)
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'Request must include "config" field'}
+    response = post_validate({'version': '1.0'})
+    assert response.status_code == 400
+    assert response.get_json() == {'error': '"config" must be a YAML string'}
+
+
+def test_oversized_request_bodies_are_rejected():
+    client = app.app.test_client()
+    config = 'version: 1.0\n' + '#' * app.MAX_REQUEST_SIZE
+    response = post_validate(config)
+    assert response.status_code == 413
+    assert response.get_json() == {'error': f'Request body exceeds {app.MAX_REQUEST_SIZE} bytes'}
+    response = client.post('/generate', json={'version': config})
+    assert response.status_code == 413
+
+
+def test_empty_and_non_mapping_configs_are_invalid():
+    for config in ('', '  \n\t'):
+        response = post_validate(config)
+        assert response.status_code == 200
+        assert response.get_json() == {'valid': False, 'errors': ['Configuration is empty']}
+    for config in ('- version: 1.0\n', '42', '~', '# only a comment\n'):
+        response = post_validate(config)
+        assert response.status_code == 200
+        assert response.get_json() == {'valid': False, 'errors': ['Configuration must be a YAML mapping']}
@@ -0,0 +1,89 @@
+from validation import validate_config, validate_plugin
+
+
+def plugin(plugin_type, **configuration):
+    return {'type': plugin_type, 'configuration': configuration}
+
+
+def test_valid_plugin():
+    assert validate_plugin(plugin('semantic-cache', enabled=True, similarity_threshold=0.92, ttl_seconds=3600)) == []
+
+
+def test_integer_fields_reject_integral_floats():
+    assert validate_plugin(plugin('semantic-cache', enabled=True, ttl_seconds=3.0)) == [
+        "Plugin 'semantic-cache': ttl_seconds must be a non-negative integer"
+    ]
+    assert validate_plugin(plugin('router_replay', enabled=True, max_records=5.0)) == [
+        "Plugin 'router_replay': max_records must be a positive integer"
+    ]
+
+
+def test_valid_config():
+    config = {
+        'version': '1.0',
+        'listeners': [{'port': 8888, 'endpoints': [{'name': 'default', 'url': 'http://localhost:8000'}]}],
+        'decisions': [{'name': 'default_route', 'endpoint': 'default'}]
+    }
+    assert validate_config(config) == {'valid': True, 'errors': []}
+
+
+def test_non_mapping_listeners_report_missing_port():
+    assert validate_config({'version': '1.0', 'listeners': ['abc']})['errors'] == ["Listener 0 missing 'port' field"]
+    assert validate_config({'version': '1.0', 'listeners': {'port': 1}})['errors'] == [
+        "Listener 0 missing 'port' field"
+    ]
+
+
+def test_memoized_plugins_keep_nan_distinct_from_null():
+    config = {
+        'version': '1.0',
+        'listeners': [{'port': 8888, 'endpoints': [{'name': 'default', 'url': 'http://localhost:8000'}]}],
+        'decisions': [
+            {'name': 'a', 'endpoint': 'default', 'plugins': [plugin('semantic-cache', enabled=True, similarity_threshold=float('nan'))]},
+            {'name': 'b', 'endpoint': 'default', 'plugins': [plugin('semantic-cache', enabled=True, similarity_threshold=None)]}
+        ]
+    }
+    assert validate_config(config)['errors'] == [
+        "Decision 1: Plugin 'semantic-cache': threshold must be between 0.0 and 1.0"
+    ]
+
+
+def test_non_mapping_plugins_report_missing_type():
+    assert validate_plugin('semantic-cache') == ["Plugin missing 'type' field"]
+    assert validate_plugin(None) == ["Plugin missing 'type' field"]
+
+
+def test_shared_plugins_report_errors_for_every_decision():
+    plugins = [plugin('semantic-cache', enabled=True, similarity_threshold=2)]
+    config = {
+        'version': '1.0',
+        'listeners': [{'port': 8888, 'endpoints': [{'name': 'default', 'url': 'http://localhost:8000'}]}],
+        'decisions': [{'name': name, 'endpoint': 'default', 'plugins': plugins} for name in ('a', 'b')]
+    }
+    assert validate_config(config)['errors'] == [
+        "Decision 0: Plugin 'semantic-cache': threshold must be between 0.0 and 1.0",
+        "Decision 1: Plugin 'semantic-cache': threshold must be between 0.0 and 1.0"
+    ]
+
+
+def test_numeric_fields_reject_booleans():
+    assert validate_plugin(plugin('semantic-cache', enabled=True, similarity_threshold=True, ttl_seconds=True)) == [
+        "Plugin 'semantic-cache': threshold must be between 0.0 and 1.0",
+        "Plugin 'semantic-cache': ttl_seconds must be a non-negative integer"
+    ]
+    assert validate_plugin(plugin('router_replay', enabled=True, max_records=True)) == [
+        "Plugin 'router_replay': max_records must be a positive integer"
+    ]
+
+
+def test_max_errors_marks_truncation_only_when_errors_were_left_out():
+    config = {'listeners': [{}]}
+    assert validate_config(config, max_errors=1) == {
+        'valid': False, 'errors': ["Configuration missing 'version' field"], 'truncated': True
+    }
+    assert validate_config(config, max_errors=2) == {
+        'valid': False, 'errors': ["Configuration missing 'version' field", "Listener 0 missing 'port' field"]
+    }
+    assert validate_config({'version': '1.0'}, max_errors=1) == {
+        'valid': False, 'errors': ["Configuration missing 'listeners' field"]
+    }
@@ -0,0 +1,265 @@
+"""
+Validation of semantic router configurations.
+
+Kept free of Flask and YAML dependencies and fully annotated so it can be
+compiled with mypyc (see setup.py); app.py imports the compiled extension
+transparently when it has been built.
+"""
+
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, TypedDict
+import itertools
+
+import fastjsonschema
+
+
+class _ValidationResultBase(TypedDict):
+    valid: bool
+    errors: List[str]
+
+
+class ValidationResult(_ValidationResultBase, total=False):
+    """Result of validate_config; 'truncated' is set when max_errors was reached."""
+    truncated: bool
+
+
+# Supported plugin types
+SUPPORTED_PLUGINS: FrozenSet[str] = frozenset({
+    'semantic-cache',
+    'jailbreak',
+    'pii',
+    'system_prompt',
+    'header_mutation',
+    'hallucination',
+    'router_replay'
+})
+
+# Fields every listener endpoint and decision must define, in reporting order
+REQUIRED_ENDPOINT_FIELDS = ('name', 'url')
+REQUIRED_DECISION_FIELDS = ('name', 'endpoint')
+_REQUIRED_ENDPOINT_FIELD_SET = frozenset(REQUIRED_ENDPOINT_FIELDS)
+_REQUIRED_DECISION_FIELD_SET = frozenset(REQUIRED_DECISION_FIELDS)
+
+# Accepted values for a plugin's 'mode' field
+VALID_MODES = frozenset({'replace', 'insert'})
+
+# Plugin configuration schemas
+PLUGIN_SCHEMAS: Dict[str, Dict[str, List[str]]] = {
+    'semantic-cache': {
+        'required': ['enabled'],
+        'optional': ['similarity_threshold', 'ttl_seconds']
+    },
+    'jailbreak': {
+        'required': ['enabled'],
+        'optional': ['threshold']
+    },
+    'pii': {
+        'required': ['enabled'],
+        'optional': ['threshold', 'pii_types_allowed']
+    },
+    'system_prompt': {
+        'required': ['enabled'],
+        'optional': ['system_prompt', 'mode']
+    },
+    'header_mutation': {
+        'required': [],
+        'optional': ['add', 'update', 'delete']
+    },
+    'hallucination': {
+        'required': ['enabled'],
+        'optional': ['use_nli', 'hallucination_action']
+    },
+    'router_replay': {
+        'required': ['enabled'],
+        'optional': ['max_records', 'capture_request_body', 'capture_response_body', 'max_body_bytes']
+    }
+}
+
+# Draft-04 treats 3.0 as a number but not an integer, unlike later drafts
+JSON_SCHEMA_DRAFT = 'http://json-schema.org/draft-04/schema#'
+
+# JSON Schema constraints for plugin configuration fields, applied to every plugin
+PLUGIN_FIELD_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    'enabled': {'type': 'boolean'},
+    'threshold': {'type': 'number', 'minimum': 0, 'maximum': 1},
+    'similarity_threshold': {'type': 'number', 'minimum': 0, 'maximum': 1},
+    'ttl_seconds': {'type': 'integer', 'minimum': 0},
+    'max_records': {'type': 'integer', 'minimum': 1},
+    'mode': {'enum': sorted(VALID_MODES)}
+}
+
+# Error messages reported when a plugin configuration field fails its schema
+PLUGIN_FIELD_ERRORS: Dict[str, str] = {
+    'enabled': "'enabled' must be a boolean",
+    'threshold': "threshold must be between 0.0 and 1.0",
+    'similarity_threshold': "threshold must be between 0.0 and 1.0",
+    'ttl_seconds': "ttl_seconds must be a non-negative integer",
+    'max_records': "max_records must be a positive integer",
+    'mode': "mode must be 'replace' or 'insert'"
+}
+
+# Full JSON Schema for each plugin's configuration object
+PLUGIN_JSON_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    name: {
+        '$schema': JSON_SCHEMA_DRAFT,
+        'type': 'object',
+        'required': schema['required'],
+        'properties': PLUGIN_FIELD_SCHEMAS,
+        'additionalProperties': True
+    }
+    for name, schema in PLUGIN_SCHEMAS.items()
+}
+
+# Validators compiled once at import, flattened so each check is a single lookup:
+# plugin type -> (configuration validator, required fields)
+_PLUGIN_VALIDATORS: Dict[str, Tuple[Callable[[Any], Any], Tuple[str, ...]]] = {
+    name: (fastjsonschema.compile(PLUGIN_JSON_SCHEMAS[name]), tuple(PLUGIN_SCHEMAS[name]['required']))
+    for name in SUPPORTED_PLUGINS
+}
+# (field, validator, error message) in reporting order
+_FIELD_VALIDATORS: Tuple[Tuple[str, Callable[[Any], Any], str], ...] = tuple(
+    (field, fastjsonschema.compile({'$schema': JSON_SCHEMA_DRAFT, **schema}), PLUGIN_FIELD_ERRORS[field])
+    for field, schema in PLUGIN_FIELD_SCHEMAS.items()
+)
+
+
+def validate_plugin(plugin: Any) -> List[str]:
+    """Validate a single plugin configuration."""
+    errors = []
+    
+    # Plugins come straight from user YAML, so they need not be mappings at all
+    if not isinstance(plugin, dict) or 'type' not in plugin:
+        errors.append("Plugin missing 'type' field")
+        return errors
+    
+    plugin_type = plugin['type']
+    entry = _PLUGIN_VALIDATORS.get(plugin_type) if isinstance(plugin_type, str) else None
+    if entry is None:
+        errors.append(f"Unsupported plugin type: {plugin_type}")
+        return errors
+    
+    if 'configuration' not in plugin:
+        errors.append(f"Plugin '{plugin_type}' missing 'configuration' field")
+        return errors
+    
+    validator, required = entry
+    config = plugin['configuration']
+    try:
+        validator(config)
+    except fastjsonschema.JsonSchemaException:
+        errors.extend(describe_plugin_errors(plugin_type, required, config))
+    
+    return errors
+
+
+def describe_plugin_errors(plugin_type: str, required: Iterable[str], config: Any) -> List[str]:
+    """Collect every schema violation in a plugin configuration that failed validation."""
+    if not isinstance(config, dict):
+        return [f"Plugin '{plugin_type}': 'configuration' must be an object"]
+    
+    errors = []
+    
+    # Check required fields
+    for field in required:
+        if field not in config:
+            errors.append(f"Plugin '{plugin_type}' missing required field: {field}")
+    
+    # Validate field types and values
+    for field, validator, message in _FIELD_VALIDATORS:
+        if field not in config:
+            continue
+        try:
+            validator(config[field])
+        except fastjsonschema.JsonSchemaException:
+            error = f"Plugin '{plugin_type}': {message}"
+            if error not in errors:
+                errors.append(error)
+    
+    return errors
+
+
+def validate_plugin_memoized(plugin: Any, seen: Dict[int, List[str]]) -> List[str]:
+    """Validate a plugin, reusing the result recorded in seen for the same plugin object.
+
+    Keyed on identity, so seen must not outlive the configuration holding the
+    plugins; shared plugins (YAML aliases, build_config_dict's one list) hit it.
+    """
+    key = id(plugin)
+    if key not in seen:
+        seen[key] = validate_plugin(plugin)
+    return seen[key]
+
+
+def iter_config_errors(config: Dict[str, Any]) -> Iterator[str]:
+    """Yield the validation errors of a semantic router configuration in order."""
+    # Check version
+    if 'version' not in config:
+        yield "Configuration missing 'version' field"
+    
+    # Check listeners
+    if 'listeners' not in config:
+        yield "Configuration missing 'listeners' field"
+    else:
+        for i, listener in enumerate(config['listeners']):
+            if not isinstance(listener, dict):
+                yield f"Listener {i} missing 'port' field"
+                continue
+            
+            if 'port' not in listener:
+                yield f"Listener {i} missing 'port' field"
+            else:
+                port = listener['port']
+                # type() rather than isinstance() so that booleans are rejected
+                if type(port) is not int or port <= 0:
+                    yield f"Listener {i}: port must be a positive integer"
+            
+            if 'endpoints' in listener:
+                for j, endpoint in enumerate(listener['endpoints']):
+                    # One set comparison covers the common case of no missing fields
+                    if isinstance(endpoint, dict) and endpoint.keys() >= _REQUIRED_ENDPOINT_FIELD_SET:
+                        continue
+                    for field in REQUIRED_ENDPOINT_FIELDS:
+                        if field not in endpoint:
+                            yield f"Listener {i}, endpoint {j} missing '{field}' field"
+    
+    # Check decisions
+    if 'decisions' in config:
+        # Decisions often share the same plugin objects, so validate each one once
+        seen_plugins: Dict[int, List[str]] = {}
+        for i, decision in enumerate(config['decisions']):
+            if not (isinstance(decision, dict) and decision.keys() >= _REQUIRED_DECISION_FIELD_SET):
+                for field in REQUIRED_DECISION_FIELDS:
+                    if field not in decision:
+                        yield f"Decision {i} missing '{field}' field"
+            
+            # Validate plugins
+            if 'plugins' in decision:
+                prefix = f"Decision {i}: "
+                for plugin in decision['plugins']:
+                    plugin_errors = validate_plugin_memoized(plugin, seen_plugins)
+                    if plugin_errors:
+                        yield from (prefix + e for e in plugin_errors)
+
+
+def validate_config(config: Dict[str, Any], max_errors: Optional[int] = None) -> ValidationResult:
+    """Validate a semantic router configuration.
+    
+    When max_errors is set, at most that many errors are reported and the
+    result is marked as truncated if there were more.
+    """
+    if max_errors:
+        # One error past the limit tells whether anything was left out
+        errors = list(itertools.islice(iter_config_errors(config), max_errors + 1))
+        truncated = len(errors) > max_errors
+        del errors[max_errors:]
+    else:
+        errors = list(iter_config_errors(config))
+        truncated = False
+    
+    result: ValidationResult = {
+        'valid': len(errors) == 0,
+        'errors': errors
+    }
+    if truncated:
+        result['truncated'] = True
+    
+    return result